@@ -1,59 +1,118 @@
+import argparse
+from typing import Optional
+
+import numpy as np
 from student_client import create_student_gym_env
+from student_client.student_gym_env_vectorized import create_student_gym_env_vectorized
 
 
-def main():
+def run_single_env(step_size: int, num_steps: int, seed: Optional[int] = None):
 
-    step_size = 10
     env = create_student_gym_env()
 
     # Reset environment to get initial observation
     obs, info = env.reset()
     print(f"📋 Starting episode {info.get('episode_id', 'unknown')}")
 
-    # Initialize data collection arrays
-    observations = []
-    actions = []
-    rewards = []
-    total_timesteps = 0
-
-    for step in range(50):
-
-        # Choose a random action (0=do nothing, 1=repair, 2=sell)
-        action = env.action_space.sample()
-        print(action)
-
-        # Take step in environment
-        obs_result, reward, terminated, truncated, info = env.step(
-            action=action
-        )
-
-        observations.append(obs_result)
-        actions.append(action)
-
-        rewards.append(reward)
+    # Choose all random actions up front (0=do nothing, 1=repair, 2=sell)
+    actions = np.random.default_rng(seed).integers(0, 3, size=num_steps, dtype=np.int8)
 
-        # Update total timesteps - server advances by step_size and returns all observations
-        total_timesteps += step_size
+    # Run the whole trajectory with a single request - the server stops at the end of the episode
+    observations, rewards, terminated, truncated, info = env.rollout(actions, step_size=step_size)
+    actions = actions[:len(rewards)]
+    total_reward = float(rewards.sum())
 
-        # Print progress every step
-        if step % 1 == 0:
-            print(f" Step {total_timesteps}: Reward={reward:.2f}, Total={sum(rewards):.2f}")
+    # Print progress for every step
+    for step, (reward, cumulative_reward) in enumerate(zip(rewards, np.cumsum(rewards))):
+        print(f" Step {(step + 1) * step_size}: Action={actions[step]}, Reward={reward:.2f}, Total={cumulative_reward:.2f}")
 
-        # Check if episode ended
-        if terminated or truncated:
-            print(f"🏁 Episode ended at step {total_timesteps} with reward={reward:.2f}")
-            break
+    if terminated or truncated:
+        print(f"🏁 Episode ended at step {len(rewards) * step_size} with reward={rewards[-1]:.2f}")
 
     # Print summary statistics
-    total_reward = sum(rewards)
     print(f"\n Episode Summary:")
     print(f"   Total Steps: {len(actions)}")
     print(f"   Total Reward: {total_reward:.2f}")
     print(
-        f"   Actions Taken: {len([a for a in actions if a == 1])} repairs, {len([a for a in actions if a == 2])} sell")
+        f"   Actions Taken: {np.count_nonzero(actions == 1)} repairs, {np.count_nonzero(actions == 2)} sell")
 
     # Finish episode
     env.close()
 
+
+def run_vectorized_envs(num_envs: int, step_size: int, num_steps: int, seed: Optional[int] = None):
+
+    # All environments are stepped by a single batched request per iteration.
+    # Only the last observation of each step is kept so every env yields a (9,) row.
+    env = create_student_gym_env_vectorized(
+        num_envs=num_envs,
+        step_size=step_size,
+        return_all_states=False
+    )
+    num_envs = env.num_envs
+
+    obs, infos = env.reset()
+    print(f"📋 Starting episodes {env.episode_ids}")
+
+    # Choose all random actions up front, one per environment and step (0=do nothing, 1=repair, 2=sell)
+    actions = np.random.default_rng(seed).integers(0, 3, size=(num_steps, num_envs), dtype=np.int8)
+
+    # Running reward of the current episode in each environment, and totals of finished episodes
+    total_rewards = np.zeros(num_envs, dtype=np.float32)
+    episode_rewards = []
+    n_repair = 0
+    n_sell = 0
+    total_timesteps = 0
+
+    for step in range(num_steps):
+
+        # Restart environments whose episode ended on the previous step
+        terminated_envs = env.get_terminated_env_indices()
+        if terminated_envs:
+            print(f"🏁 Environments {terminated_envs} ended with rewards "
+                  f"{np.round(total_rewards[terminated_envs], 2)}, resetting them")
+            episode_rewards.extend(total_rewards[terminated_envs].tolist())
+            total_rewards[terminated_envs] = 0.0
+            env.reset_specific_envs(terminated_envs)
+
+        step_actions = actions[step]
+
+        # Take one batched step in all environments
+        obs, reward, terminateds, truncateds, infos = env.step(step_actions)
+
+        total_rewards += reward
+        n_repair += np.count_nonzero(step_actions == 1)
+        n_sell += np.count_nonzero(step_actions == 2)
+
+        total_timesteps += step_size
+        print(f" Step {total_timesteps}: Rewards={np.round(reward, 2)}, Totals={np.round(total_rewards, 2)}")
+
+    # Print summary statistics
+    print(f"\n Summary ({num_envs} environments):")
+    print(f"   Total Steps: {num_steps}")
+    print(f"   Finished Episodes: {len(episode_rewards)}, Rewards: {np.round(episode_rewards, 2)}")
+    print(f"   Current Episode Rewards: {np.round(total_rewards, 2)}")
+    print(f"   Actions Taken: {n_repair} repairs, {n_sell} sell")
+
+    env.close()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Collect a random-policy trajectory")
+    parser.add_argument('--num-envs', type=int, default=1,
+                        help="Number of environments to step in parallel (1 = single environment)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Seed for the random actions (random if not set)")
+    args = parser.parse_args()
+
+    step_size = 10
+    num_steps = 50
+
+    if args.num_envs > 1:
+        run_vectorized_envs(args.num_envs, step_size, num_steps, seed=args.seed)
+    else:
+        run_single_env(step_size, num_steps, seed=args.seed)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
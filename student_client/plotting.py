@@ -5,25 +5,57 @@ Basic plotting functions for visualizing observations and rewards.
 Students can use these as inspiration to create their own visualization functions.
 """
 
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import List, Optional
+from typing import List, Optional, Union
 
+# Default names of the 9 observation dimensions
+_DEFAULT_SENSOR_NAMES = (
+    'HPC_Tout',      # High Pressure Compressor Temperature Outlet
+    'HP_Nmech',      # High Pressure Shaft Mechanical Speed
+    'HPC_Tin',       # High Pressure Compressor Temperature Inlet
+    'LPT_Tin',       # Low Pressure Turbine Temperature Inlet
+    'Fuel_flow',     # Fuel Flow Rate
+    'HPC_Pout_st',   # High Pressure Compressor Pressure Outlet (static)
+    'LP_Nmech',      # Low Pressure Shaft Mechanical Speed
+    'phase_type',    # Flight Phase Type
+    'DTAMB'          # Ambient Temperature Deviation
+)
+
+
+def _get_pyplot():
+    """
+    Import matplotlib.pyplot on first use, so that importing student_client
+    does not load matplotlib.
+
+    Setting the STUDENT_PLOT_BACKEND environment variable (e.g. to 'Agg')
+    selects the matplotlib backend, which allows rendering figures offline.
+    It is only applied if pyplot has not been imported yet, so a backend the
+    user already chose (and their open figures) is left untouched.
+    """
+    import matplotlib
+    backend = os.getenv('STUDENT_PLOT_BACKEND')
+    if backend and 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use(backend)
+    import matplotlib.pyplot as plt
+    return plt
 
-import numpy as np
-import matplotlib.pyplot as plt
-from typing import List, Optional
 
 def plot_observations(
-    observations: List[np.ndarray],
+    observations: Union[List[np.ndarray], np.ndarray],
     actions: Optional[List[int]] = None,
     sensor_names: Optional[List[str]] = None,
-    figsize: tuple = (12, 4),
-    title: str = "Observation Dimensions Over Time"
+    figsize: tuple = (15, 10),
+    title: str = "Observation Dimensions Over Time",
+    save_path: Optional[str] = None
 ) -> None:
     """
     Plot observation dimensions over time, handling batched observations.
 
+    All dimensions are drawn in a single figure, one subplot per dimension
+    (three per row) sharing the step axis.
+
     This function accepts a list where each element is an array of observations
     returned by a single `step()` call (e.g., shape (10, 9)). It concatenates
     all observations into a continuous sequence and, if actions are provided,
@@ -33,12 +65,16 @@ def plot_observations(
     Args:
         observations: List of observation batches. Each batch is a 2D numpy array
                       of shape (n_steps_in_batch, 9). The final batch may be shorter.
+                      Equal-length batches may also be passed as a single array of
+                      shape (n_batches, n_steps_in_batch, 9), which is used without copying.
         actions: Optional list of actions, one per batch. Must have the same length
                  as `observations`. The action is associated with the first step
                  of its batch.
         sensor_names: Optional list of 9 names for the observation dimensions.
-        figsize: Figure size (width, height) for each individual dimension plot.
-        title: Title for each plot (the dimension name is appended).
+        figsize: Figure size (width, height) of the whole figure.
+        title: Title of the figure (each subplot is titled with its dimension name).
+        save_path: Optional file path. If given, the figure is saved there and
+                   closed instead of being shown.
 
     Example:
         >>> from student_client import create_student_gym_env, plot_observations
@@ -56,109 +92,110 @@ def plot_observations(
         >>> env.close()
         >>> plot_observations(observations, actions)
     """
-    if not observations:
+    if len(observations) == 0:
         print("⚠️ No observations provided.")
         return
 
-    # Flatten all observation batches into one long array
-    obs_arrays = []
-    batch_starts = []      # starting index of each batch in the concatenated array
-    current_idx = 0
-    for obs in observations:
-        # Ensure each batch is at least 2D
-        if obs.ndim == 1:
-            obs = obs.reshape(1, -1)
-        obs_arrays.append(obs)
-        batch_starts.append(current_idx)
-        current_idx += obs.shape[0]
-
-    obs_full = np.concatenate(obs_arrays, axis=0)   # shape (total_steps, 9)
+    plt = _get_pyplot()
+
+    # Ensure actions list matches number of batches
+    if actions is not None and len(actions) != len(observations):
+        print(f"⚠️ Warning: number of actions ({len(actions)}) != number of batches ({len(observations)}). "
+              f"Truncating to the shorter length.")
+        min_len = min(len(actions), len(observations))
+        actions = actions[:min_len]
+        observations = observations[:min_len]
+
+    if isinstance(observations, np.ndarray) and observations.ndim == 3:
+        # Equal-length batches in a single array: flatten as a view, no copy
+        obs_full = np.asarray(observations, dtype=np.float32).reshape(-1, observations.shape[2])
+        batch_starts = np.arange(observations.shape[0]) * observations.shape[1]
+    else:
+        # Flatten all observation batches into one long array
+        obs_arrays = []
+        batch_starts = []      # starting index of each batch in the concatenated array
+        current_idx = 0
+        for obs in observations:
+            obs = np.asarray(obs, dtype=np.float32)
+            # Ensure each batch is at least 2D
+            if obs.ndim == 1:
+                obs = obs.reshape(1, -1)
+            obs_arrays.append(obs)
+            batch_starts.append(current_idx)
+            current_idx += obs.shape[0]
+
+        obs_full = np.concatenate(obs_arrays, axis=0)   # shape (total_steps, 9)
+
     total_steps = obs_full.shape[0]
     steps = np.arange(total_steps)
 
     # Handle actions: create an array aligned with obs_full
     action_full = None
     if actions is not None:
-        # Ensure actions list matches number of batches
-        if len(actions) != len(observations):
-            print(f"⚠️ Warning: number of actions ({len(actions)}) != number of batches ({len(observations)}). "
-                  f"Truncating to the shorter length.")
-            min_len = min(len(actions), len(observations))
-            actions = actions[:min_len]
-
-            # Re‑compute batch_starts and obs_full using only the first min_len batches
-            obs_arrays = []
-            batch_starts = []
-            current_idx = 0
-            for i in range(min_len):
-                obs = observations[i]
-                if obs.ndim == 1:
-                    obs = obs.reshape(1, -1)
-                obs_arrays.append(obs)
-                batch_starts.append(current_idx)
-                current_idx += obs.shape[0]
-            obs_full = np.concatenate(obs_arrays, axis=0)
-            total_steps = obs_full.shape[0]
-            steps = np.arange(total_steps)
-
         # Create action array: -1 indicates no action (Do Nothing is not plotted)
-        action_full = np.full(total_steps, -1, dtype=int)
-        for i, start_idx in enumerate(batch_starts):
-            action_full[start_idx] = actions[i]
+        action_full = np.full(total_steps, -1, dtype=np.int8)
+        action_full[batch_starts] = np.asarray(actions, dtype=np.int8)
 
     # Default sensor names if not provided
     if sensor_names is None:
-        sensor_names = [
-            'HPC_Tout',      # High Pressure Compressor Temperature Outlet
-            'HP_Nmech',      # High Pressure Shaft Mechanical Speed
-            'HPC_Tin',       # High Pressure Compressor Temperature Inlet
-            'LPT_Tin',       # Low Pressure Turbine Temperature Inlet
-            'Fuel_flow',     # Fuel Flow Rate
-            'HPC_Pout_st',   # High Pressure Compressor Pressure Outlet (static)
-            'LP_Nmech',      # Low Pressure Shaft Mechanical Speed
-            'phase_type',    # Flight Phase Type
-            'DTAMB'
-        ]
+        sensor_names = _DEFAULT_SENSOR_NAMES
 
     num_dims = obs_full.shape[1]
 
-    # Plot each dimension separately
-    for i in range(num_dims):
-        plt.figure(figsize=figsize)
-        plt.plot(steps, obs_full[:, i], 'b-', linewidth=2, label='Observation')
+    # Find steps where action is 1 or 2 once, shared by every dimension plot
+    has_repair = has_sell = False
+    if action_full is not None:
+        repair_idx = np.flatnonzero(action_full == 1)
+        sell_idx = np.flatnonzero(action_full == 2)
+        has_repair = len(repair_idx) > 0
+        has_sell = len(sell_idx) > 0
+
+    # Plot all dimensions in one figure, three subplots per row
+    num_cols = 3
+    num_rows = -(-num_dims // num_cols)
+    fig, axes = plt.subplots(num_rows, num_cols, figsize=figsize, sharex=True, squeeze=False,
+                             constrained_layout=True)
+
+    handles = []
+    for i, ax in enumerate(axes.flat):
+        if i >= num_dims:
+            ax.set_visible(False)
+            continue
+
+        ax.plot(steps, obs_full[:, i], 'b-', linewidth=2, label='Observation')
 
         # Use sensor name if available, else fallback to index
         name = sensor_names[i] if i < len(sensor_names) else f"Dimension {i}"
-        plt.title(f"{title} – {name}", fontsize=14, fontweight='bold')
-        plt.xlabel('Step', fontsize=12)
-        plt.ylabel('Value', fontsize=12)
-        plt.grid(True, alpha=0.3)
+        ax.set_title(name, fontsize=12, fontweight='bold')
+        if i >= num_dims - num_cols:
+            # Lowest visible plot of its column: sharex only keeps tick labels on the last row
+            ax.set_xlabel('Step', fontsize=10)
+            ax.tick_params(labelbottom=True)
+        ax.set_ylabel('Value', fontsize=10)
+        ax.grid(True, alpha=0.3)
 
         # Add action markers only for Repair (1) and Sell (2)
-        if action_full is not None:
-            # Find indices where action is 1 or 2
-            repair_idx = np.where(action_full == 1)[0]
-            sell_idx   = np.where(action_full == 2)[0]
-
-            if len(repair_idx) > 0:
-                plt.scatter(repair_idx, obs_full[repair_idx, i],
-                            color='red', marker='o', s=80,
-                            label='Repair (1)', alpha=0.8, zorder=5)
-            if len(sell_idx) > 0:
-                plt.scatter(sell_idx, obs_full[sell_idx, i],
-                            color='green', marker='s', s=80,
-                            label='Sell (2)', alpha=0.8, zorder=5)
-
-        # Build legend (unique labels only)
-        if action_full is not None and (1 in action_full or 2 in action_full):
-            handles = []
-            if 1 in action_full:
-                handles.append(plt.scatter([], [], color='red', marker='o', s=80, label='Repair (1)', alpha=0.8))
-            if 2 in action_full:
-                handles.append(plt.scatter([], [], color='green', marker='s', s=80, label='Sell (2)', alpha=0.8))
-            plt.legend(handles=handles, loc='best', fontsize=10)
-
-        plt.tight_layout()
+        handles = []
+        if has_repair:
+            handles.append(ax.scatter(repair_idx, obs_full[repair_idx, i],
+                                      color='red', marker='o', s=40,
+                                      label='Repair (1)', alpha=0.8, zorder=5))
+        if has_sell:
+            handles.append(ax.scatter(sell_idx, obs_full[sell_idx, i],
+                                      color='green', marker='s', s=40,
+                                      label='Sell (2)', alpha=0.8, zorder=5))
+
+    fig.suptitle(title, fontsize=14, fontweight='bold')
+
+    # Single legend for the whole figure (markers are the same in every subplot),
+    # placed outside the axes grid so constrained layout reserves room for it
+    if handles:
+        fig.legend(handles=handles, loc='outside upper right', ncol=len(handles), fontsize=10)
+
+    if save_path is not None:
+        fig.savefig(save_path)
+        plt.close(fig)
+    else:
         plt.show()
 
 
@@ -166,7 +203,8 @@ def plot_rewards(
     rewards: List[float],
     actions: Optional[List[int]] = None,
     figsize: tuple = (12, 6),
-    title: str = "Step Rewards Over Time"
+    title: str = "Step Rewards Over Time",
+    save_path: Optional[str] = None
 ) -> None:
     """
     Simple function to plot step rewards over time.
@@ -179,6 +217,8 @@ def plot_rewards(
         actions: Optional list of actions taken at each step
         figsize: Figure size (width, height)
         title: Plot title
+        save_path: Optional file path. If given, the figure is saved there and
+                   closed instead of being shown.
         
     Example:
         >>> from student_client import create_student_gym_env, plot_rewards
@@ -202,31 +242,39 @@ def plot_rewards(
         >>> # Plot step rewards
         >>> plot_rewards(rewards, actions)
     """
-    if not rewards:
+    if len(rewards) == 0:
         print("⚠️ No rewards provided.")
         return
+
+    plt = _get_pyplot()
     
-    steps = np.arange(len(rewards))
-    cumulative_reward = np.sum(rewards)
+    # Convert once and reuse the array for plotting and statistics
+    rewards_arr = np.asarray(rewards, dtype=np.float32)
+    steps = np.arange(rewards_arr.size)
+    cumulative_reward = rewards_arr.sum()
+    average_reward = cumulative_reward / rewards_arr.size
+    max_reward, min_reward = rewards_arr.max(), rewards_arr.min()
     
     # Create figure
-    plt.figure(figsize=figsize)
+    fig = plt.figure(figsize=figsize, constrained_layout=True)
     
     # Plot individual rewards as a line with markers
-    plt.plot(steps, rewards, 'b-', linewidth=2, 
+    plt.plot(steps, rewards_arr, 'b-', linewidth=2, 
             marker='o', markersize=8, label=f'Step Reward')
     
     # Add action markers if provided (only Repair and Sell)
     if actions is not None and len(actions) == len(rewards):
-        for step, action in enumerate(actions):
-            if action == 1:  # Repair
-                plt.scatter(step, rewards[step], color='red', 
-                          marker='o', s=120, label='Repair',
-                          edgecolor='black', linewidth=1, alpha=0.8, zorder=5)
-            elif action == 2:  # Sell
-                plt.scatter(step, rewards[step], color='green', 
-                          marker='s', s=120, label='Sell',
-                          edgecolor='black', linewidth=1, alpha=0.8, zorder=5)
+        actions_arr = np.asarray(actions)
+        repair_mask = actions_arr == 1
+        sell_mask = actions_arr == 2
+        if repair_mask.any():
+            plt.scatter(steps[repair_mask], rewards_arr[repair_mask], color='red',
+                        marker='o', s=120, label='Repair',
+                        edgecolor='black', linewidth=1, alpha=0.8, zorder=5)
+        if sell_mask.any():
+            plt.scatter(steps[sell_mask], rewards_arr[sell_mask], color='green',
+                        marker='s', s=120, label='Sell',
+                        edgecolor='black', linewidth=1, alpha=0.8, zorder=5)
     
     # Customize plot
     plt.title(title, fontsize=16, fontweight='bold')
@@ -237,34 +285,22 @@ def plot_rewards(
     # Add horizontal line at y=0 for reference
     plt.axhline(0, color='gray', linestyle='--', alpha=0.5)
     
-    # Add legend with cumulative reward
-    handles, labels = plt.gca().get_legend_handles_labels()
-    
-    # Remove duplicate labels and add cumulative reward info
-    unique_labels = []
-    unique_handles = []
-    for handle, label in zip(handles, labels):
-        if label not in unique_labels:
-            unique_labels.append(label)
-            unique_handles.append(handle)
-    
-    # Add cumulative reward to legend
-    cumulative_handle = plt.Line2D([], [], color='black', linestyle='none', 
+    # Add legend with cumulative reward - each marker class is a single labelled artist already
+    cumulative_handle = plt.Line2D([], [], color='black', linestyle='none',
                                    marker='', markersize=0, label=f'Cumulative: {cumulative_reward:.1f}')
-    unique_handles.append(cumulative_handle)
-    unique_labels.append(f'Cumulative: {cumulative_reward:.1f}')
+    handles, _ = plt.gca().get_legend_handles_labels()
+    plt.legend(handles=handles + [cumulative_handle], loc='best', fontsize=10, framealpha=0.9)
     
-    if unique_handles:
-        plt.legend(handles=unique_handles, labels=unique_labels, 
-                  loc='best', fontsize=10, framealpha=0.9)
-    
-    plt.tight_layout()
-    plt.show()
+    if save_path is not None:
+        fig.savefig(save_path)
+        plt.close(fig)
+    else:
+        plt.show()
     
     # Print summary statistics
     print(f"📊 Reward Statistics:")
-    print(f"   Total Steps: {len(rewards)}")
+    print(f"   Total Steps: {rewards_arr.size}")
     print(f"   Total Reward: {cumulative_reward:.2f}")
-    print(f"   Average Reward: {np.mean(rewards):.2f}")
-    print(f"   Max Reward: {np.max(rewards):.2f}")
-    print(f"   Min Reward: {np.min(rewards):.2f}")
\ No newline at end of file
+    print(f"   Average Reward: {average_reward:.2f}")
+    print(f"   Max Reward: {max_reward:.2f}")
+    print(f"   Min Reward: {min_reward:.2f}")
\ No newline at end of file
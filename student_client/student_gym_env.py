@@ -5,6 +5,7 @@ A simplified gym environment for educational purposes.
 Provides standard gym interface without exposing internal implementation details.
 """
 
+import json
 import logging
 import os
 from typing import Dict, Tuple, Optional, Any, List
@@ -22,6 +23,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# httpx needs the optional h2 package to speak HTTP/2
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+def _resolve_http2(requested: bool, server_url: str) -> bool:
+    """Return whether the HTTP client should be created with HTTP/2 enabled"""
+    if not requested:
+        return False
+    if not _HTTP2_AVAILABLE:
+        logger.warning("http2=True requires the 'h2' package (pip install h2), using HTTP/1.1")
+        return False
+    if not server_url.startswith('https://'):
+        # httpx only negotiates HTTP/2 over TLS, plain http:// stays on HTTP/1.1
+        logger.warning("http2=True only takes effect for https:// server URLs, using HTTP/1.1")
+        return False
+    return True
+
 
 class StudentGymEnvConfig(BaseModel):
     """Configuration for student gym environment"""
@@ -33,10 +55,36 @@ class StudentGymEnvConfig(BaseModel):
     timeout: float = 30.0
     prod: bool = True  # Production mode: hide internal information
     step_size: int = 10 # Number of simulation steps to compute per environment step
+    http2: bool = False  # Use HTTP/2 (https:// only, requires the h2 package)
 
 # Client version
 CLIENT_VERSION = "0.3"
 
+# Binary rollout response: this 16-byte header, then num_steps uint32 per-step state counts,
+# then num_states * 9 float32 observations, then num_steps float32 rewards
+# (all little-endian, payloads start 4-byte aligned), then info_size bytes of UTF-8 JSON
+# holding the info object of the last executed step, as in the binary step response
+_ROLLOUT_HEADER_DTYPE = np.dtype([
+    ('num_steps', '<u4'),
+    ('num_states', '<u4'),
+    ('step', '<u4'),
+    ('terminated', 'u1'),
+    ('truncated', 'u1'),
+    ('info_size', '<u2'),
+])
+
+# Binary step response: this 16-byte header, then num_states * 9 float32 observations
+# (all little-endian, payload starts 4-byte aligned), then info_size bytes of UTF-8 JSON
+# holding the same info object as the 'info' field of the JSON response
+_STEP_HEADER_DTYPE = np.dtype([
+    ('reward', '<f4'),
+    ('num_states', '<u4'),
+    ('step', '<u4'),
+    ('terminated', 'u1'),
+    ('truncated', 'u1'),
+    ('info_size', '<u2'),
+])
+
 class StudentGymEnv(gym.Env):
     """
     Student Gym Environment
@@ -91,14 +139,17 @@ class StudentGymEnv(gym.Env):
         httpx_logger = httpx_logging.getLogger("httpx")
         httpx_logger.setLevel(httpx_logging.WARNING)
         
-        # HTTP client
+        # HTTP client - kept for the lifetime of the environment so every request
+        # reuses pooled keep-alive connections instead of reconnecting
         self.client = httpx.Client(
             base_url=self.server_url,
             timeout=config.timeout,
             headers={
                 'User-Token': self.user_token,
                 'Content-Type': 'application/json'
-            }
+            },
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            http2=_resolve_http2(config.http2, self.server_url)
         )
 
         # Check for client updates
@@ -116,7 +167,10 @@ class StudentGymEnv(gym.Env):
         self.total_reward = 0.0
         self.terminated = False
         self.truncated = False
-        
+
+        # Whether the server provides the batched rollout endpoint (checked on first use)
+        self.rollout_supported = True
+
         logger.info(f"StudentGymEnv initialized with episode {self.episode_id}")
 
     def _check_for_updates(self):
@@ -380,38 +434,58 @@ class StudentGymEnv(gym.Env):
                 'return_all_states': return_all_states
             }
 
-            response = self.client.post("/api/v1/episode/step", json=step_data)
+            # Servers that support it answer with the compact binary layout, others with JSON
+            response = self.client.post(
+                "/api/v1/episode/step",
+                json=step_data,
+                headers={'Accept': 'application/octet-stream, application/json'}
+            )
             response.raise_for_status()
 
-            response_payload = response.json()
-            observation = response_payload['observation']
-            step_info = response_payload['info']
-
-            # Handle observation unrolling when return_all_states is True
-            if return_all_states and isinstance(observation, list):
-                # Check if observation is a flat list of sensor values or a list of observation arrays
-                if len(observation) > 0 and isinstance(observation[0], (int, float)):
-                    # Server returned flat list of sensor values - need to reshape
-                    # Each observation should have 9 sensor values
-                    num_observations = len(observation) // 9
-                    observations_list = []
-                    for i in range(num_observations):
-                        start_idx = i * 9
-                        end_idx = start_idx + 9
-                        obs_array = np.array(observation[start_idx:end_idx], dtype=np.float32)
-                        observations_list.append(obs_array)
-                else:
-                    # Server returned list of observation arrays
-                    observations_list = [np.array(obs, dtype=np.float32) for obs in observation]
-                
-                final_observation = observations_list
-                # Update current observation to the last state
-                self.current_observation = observations_list[-1] if observations_list else self.current_observation
+            if response.headers.get('Content-Type', '').startswith('application/octet-stream'):
+                # Decode the fixed-layout binary payload without going through JSON
+                payload = response.content
+                header = np.frombuffer(payload, dtype=_STEP_HEADER_DTYPE, count=1)[0]
+                num_states = int(header['num_states'])
+                # Copy out of the immutable response bytes so the returned batch is writable
+                observations = np.frombuffer(
+                    payload, dtype='<f4', count=num_states * 9, offset=_STEP_HEADER_DTYPE.itemsize
+                ).reshape(num_states, 9).astype(np.float32)
+
+                response_payload = {
+                    'reward': header['reward'],
+                    'terminated': bool(header['terminated']),
+                    'truncated': bool(header['truncated']),
+                    'step': int(header['step'])
+                }
+                info_offset = _STEP_HEADER_DTYPE.itemsize + observations.nbytes
+                info_size = int(header['info_size'])
+                step_info = json.loads(payload[info_offset:info_offset + info_size]) if info_size else {}
+
+                # Update current observation to the last state (own copy, independent of the returned array)
+                self.current_observation = observations[-1].copy() if num_states > 0 else self.current_observation
+                final_observation = observations if return_all_states else self.current_observation.copy()
             else:
-                # Single observation - convert to numpy array
-                observations_list = None
-                self.current_observation = np.array(observation, dtype=np.float32)
-                final_observation = self.current_observation
+                response_payload = response.json()
+                observation = response_payload['observation']
+                step_info = response_payload['info']
+
+                # Handle observation unrolling when return_all_states is True
+                if return_all_states and isinstance(observation, list):
+                    # Convert the whole batch at once: a list of observation arrays becomes (num_states, 9)
+                    observations = np.asarray(observation, dtype=np.float32)
+                    if observations.ndim == 1:
+                        # Server returned flat list of sensor values - reshape to 9 sensor values per row
+                        num_observations = len(observations) // 9
+                        observations = observations[:num_observations * 9].reshape(num_observations, 9)
+
+                    final_observation = observations
+                    # Update current observation to the last state (own copy, independent of the returned array)
+                    self.current_observation = observations[-1].copy() if len(observations) > 0 else self.current_observation
+                else:
+                    # Single observation - convert to numpy array
+                    final_observation = np.array(observation, dtype=np.float32)
+                    self.current_observation = final_observation.copy()
 
             reward = float(response_payload['reward'])
             self.terminated = response_payload['terminated']
@@ -420,7 +494,7 @@ class StudentGymEnv(gym.Env):
             self.total_reward += reward
 
             if self.terminated:
-                print(f'Episode {self.episode_id} reached termination state, reason: {step_info["reason"]}')
+                print(f'Episode {self.episode_id} reached termination state, reason: {step_info.get("reason")}')
 
             logger.debug(f"Step {self.current_step}: reward={reward}, terminated={self.terminated}")
 
@@ -435,7 +509,7 @@ class StudentGymEnv(gym.Env):
             }
 
             return (
-                np.array(final_observation),
+                np.asarray(final_observation, dtype=np.float32),
                 reward,
                 self.terminated,
                 self.truncated,
@@ -453,6 +527,145 @@ class StudentGymEnv(gym.Env):
                 {'error': str(e), 'step': self.current_step}
             )
 
+    def rollout(self, actions: np.ndarray, step_size: Optional[int] = None) -> Tuple[List[np.ndarray], np.ndarray, bool, bool, Dict]:
+        """
+        Execute a whole sequence of actions with a single server request.
+
+        Args:
+            actions: Sequence of actions to take (0=do nothing, 1=repair, 2=sell)
+            step_size: Number of steps to execute per action (default: config.step_size, max: 50)
+
+        Returns:
+            observations: List with one observation batch per executed action, each of
+                          shape (n_states_in_step, 9) like the observations returned by
+                          `step()`. The final batch may be shorter. The list can be passed
+                          directly to `plot_observations` together with the actions.
+            rewards: Array of shape (num_steps,) with the reward of each executed action
+            terminated: Whether episode is terminated
+            truncated: Whether episode was truncated
+            info: Additional information dictionary
+
+        Note:
+            - The rollout stops at the first terminated or truncated step, so
+              num_steps may be smaller than len(actions)
+            - If the server does not provide the rollout endpoint, the actions
+              are executed one `step()` call at a time
+            - An empty action sequence executes nothing and returns no batches
+        """
+        actions = np.asarray(actions, dtype=np.int8)
+        effective_step_size = step_size if step_size is not None else self.config.step_size
+        effective_step_size = min(effective_step_size, 50)
+
+        if len(actions) == 0:
+            return [], np.empty(0, dtype=np.float32), self.terminated, self.truncated, {}
+
+        if self.terminated or self.truncated:
+            if self.auto_reset:
+                self.reset()
+            else:
+                return (
+                    [],
+                    np.empty(0, dtype=np.float32),
+                    self.terminated,
+                    self.truncated,
+                    {'message': 'Episode already terminated'}
+                )
+
+        if not self.rollout_supported:
+            return self._rollout_with_steps(actions, effective_step_size)
+
+        try:
+            response = self.client.post(
+                "/api/v1/episode/rollout",
+                params={'episode_id': self.episode_id, 'step_size': effective_step_size},
+                content=actions.tobytes(),
+                headers={
+                    'Content-Type': 'application/octet-stream',
+                    'Accept': 'application/octet-stream'
+                }
+            )
+            if response.status_code in (404, 405):
+                logger.info("Server does not support batched rollouts, falling back to step()")
+                self.rollout_supported = False
+                return self._rollout_with_steps(actions, effective_step_size)
+            response.raise_for_status()
+            if not response.headers.get('Content-Type', '').startswith('application/octet-stream'):
+                # Not a rollout response (e.g. a catch-all route or a proxy page), nothing has been executed
+                logger.info("Server did not answer the rollout with binary data, falling back to step()")
+                self.rollout_supported = False
+                return self._rollout_with_steps(actions, effective_step_size)
+
+            # Decode the fixed-layout binary payload without going through JSON
+            payload = response.content
+            header = np.frombuffer(payload, dtype=_ROLLOUT_HEADER_DTYPE, count=1)[0]
+            num_steps = int(header['num_steps'])
+            num_states = int(header['num_states'])
+            offset = _ROLLOUT_HEADER_DTYPE.itemsize
+            state_counts = np.frombuffer(payload, dtype='<u4', count=num_steps, offset=offset)
+            offset += state_counts.nbytes
+            # Copy out of the immutable response bytes so the returned arrays are writable
+            all_observations = np.frombuffer(
+                payload, dtype='<f4', count=num_states * 9, offset=offset
+            ).reshape(num_states, 9).astype(np.float32)
+            offset += all_observations.nbytes
+            rewards = np.frombuffer(payload, dtype='<f4', count=num_steps, offset=offset).astype(np.float32)
+            offset += rewards.nbytes
+            info_size = int(header['info_size'])
+            step_info = json.loads(payload[offset:offset + info_size]) if info_size else {}
+
+            # Split back into one batch per step (views into the single owned array)
+            observations = np.split(all_observations, np.cumsum(state_counts[:-1], dtype=np.int64))
+
+            if num_states > 0:
+                self.current_observation = all_observations[-1].copy()
+            self.terminated = bool(header['terminated'])
+            self.truncated = bool(header['truncated'])
+            self.current_step = int(header['step'])
+            self.total_reward += float(rewards.sum())
+
+            if self.terminated:
+                print(f'Episode {self.episode_id} reached termination state, reason: {step_info.get("reason")}')
+
+            logger.debug(f"Rollout of {num_steps} steps: terminated={self.terminated}")
+
+            # Combine the last step's server info with our local info, as step() does
+            rollout_info = {
+                'step': self.current_step,
+                'episode_id': self.episode_id,
+                'total_reward': self.total_reward,
+                'step_size': effective_step_size,
+                **step_info.get('info', {})
+            }
+
+            return (
+                observations,
+                rewards,
+                self.terminated,
+                self.truncated,
+                self._filter_info_dict(rollout_info)
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to run rollout for episode {self.episode_id}: {e}")
+            raise RuntimeError(f"Could not run rollout: {str(e)}")
+
+    def _rollout_with_steps(self, actions: np.ndarray, step_size: int) -> Tuple[List[np.ndarray], np.ndarray, bool, bool, Dict]:
+        """Execute a sequence of actions with one step() request per action"""
+        observation_batches = []
+        rewards = np.empty(len(actions), dtype=np.float32)
+        num_steps = 0
+        terminated, truncated, info = self.terminated, self.truncated, {}
+
+        for action in actions:
+            observation, reward, terminated, truncated, info = self.step(int(action), step_size=step_size)
+            observation_batches.append(np.atleast_2d(observation))
+            rewards[num_steps] = reward
+            num_steps += 1
+            if terminated or truncated:
+                break
+
+        return observation_batches, rewards[:num_steps], terminated, truncated, info
+
     def close(self):
         """Clean up the environment"""
         try:
@@ -505,7 +718,8 @@ def create_student_gym_env(
     prod: bool = True,
     step_size: int = 10,
     episode_id: Optional[str] = None,
-    session_id: Optional[str] = None
+    session_id: Optional[str] = None,
+    http2: bool = False
 ) -> StudentGymEnv:
     """
     Factory function to create a student gym environment.
@@ -523,6 +737,7 @@ def create_student_gym_env(
         prod: Production mode (True to hide internal information like degradation)
         episode_id: Optional existing episode ID to restore
         session_id: Optional existing session ID
+        http2: Use HTTP/2 (only for https:// server URLs, requires the h2 package)
         
     Returns:
         StudentGymEnv instance
@@ -601,7 +816,8 @@ def create_student_gym_env(
         max_steps_per_episode=config_max_steps,
         auto_reset=config_auto_reset,
         timeout=config_timeout,
-        step_size=step_size
+        step_size=step_size,
+        http2=http2
     )
     
     return StudentGymEnv(
@@ -11,6 +11,7 @@ environments.
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Tuple, Optional, List, Union
 import numpy as np
 import gymnasium as gym
@@ -19,6 +20,8 @@ from gymnasium import spaces
 import httpx
 from pydantic import BaseModel
 
+from .student_gym_env import _resolve_http2
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +42,7 @@ class StudentGymEnvVectorizedConfig(BaseModel):
     prod: bool = True  # Production mode: hide internal information
     step_size: int = 10  # Number of simulation steps to compute per environment step
     return_all_states: bool = True  # Return observations for all steps in step_size
+    http2: bool = False  # Use HTTP/2 (https:// only, requires the h2 package)
 
 CLIENT_VERSION = "0.3"
 
@@ -94,14 +98,17 @@ class StudentGymEnvVectorized(gym.Env):
         self.prod = config.prod  # Store production mode setting
         self.return_all_states = config.return_all_states
 
-        # HTTP client
+        # HTTP client - kept for the lifetime of the environment so every request
+        # reuses pooled keep-alive connections instead of reconnecting
         self.client = httpx.Client(
             base_url=self.server_url,
             timeout=config.timeout,
             headers={
                 'User-Token': self.user_token,
                 'Content-Type': 'application/json'
-            }
+            },
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            http2=_resolve_http2(config.http2, self.server_url)
         )
 
         # Check for client updates
@@ -235,22 +242,28 @@ class StudentGymEnvVectorized(gym.Env):
         if len(self.episode_ids) != self.num_envs:
             raise ValueError(f"Expected {self.num_envs} episode IDs, got {len(self.episode_ids)}")
 
-        for i, episode_id in enumerate(self.episode_ids):
-            try:
-                # Verify episode exists
-                response = self.client.get(f"/api/v1/episode/{episode_id}")
-                response.raise_for_status()
+        def restore_episode(episode_id: str) -> Dict:
+            # Verify episode exists
+            response = self.client.get(f"/api/v1/episode/{episode_id}")
+            response.raise_for_status()
 
-                # Get the latest state
-                response = self.client.get(f"/api/v1/episode/{episode_id}/state/latest")
-                response.raise_for_status()
-                state_data = response.json()
+            # Get the latest state
+            response = self.client.get(f"/api/v1/episode/{episode_id}/state/latest")
+            response.raise_for_status()
+            return response.json()
 
-                logger.info(f"Restored episode {i + 1}/{self.num_envs}: {episode_id} at step {state_data['step']}")
+        # Issue the per-episode requests concurrently so the wait is one round trip, not num_envs
+        with ThreadPoolExecutor(max_workers=self.num_envs) as executor:
+            futures = [executor.submit(restore_episode, episode_id) for episode_id in self.episode_ids]
 
-            except Exception as e:
-                logger.error(f"Failed to restore episode {episode_id}: {e}")
-                raise RuntimeError(f"Could not restore episode: {str(e)}")
+            for i, (episode_id, future) in enumerate(zip(self.episode_ids, futures)):
+                try:
+                    state_data = future.result()
+                    logger.info(f"Restored episode {i + 1}/{self.num_envs}: {episode_id} at step {state_data['step']}")
+
+                except Exception as e:
+                    logger.error(f"Failed to restore episode {episode_id}: {e}")
+                    raise RuntimeError(f"Could not restore episode: {str(e)}")
 
     def _filter_info_dict(self, info: Dict) -> Dict:
         """
@@ -566,13 +579,15 @@ class StudentGymEnvVectorized(gym.Env):
         Returns:
             List of dictionaries with episode information
         """
+        def fetch_episode_info(episode_id: str) -> Dict:
+            response = self.client.get(f"/api/v1/episode/{episode_id}")
+            response.raise_for_status()
+            return response.json()
+
         try:
-            episode_infos = []
-            for episode_id in self.episode_ids:
-                response = self.client.get(f"/api/v1/episode/{episode_id}")
-                response.raise_for_status()
-                episode_infos.append(response.json())
-            return episode_infos
+            # Fetch all episodes concurrently, results keep the episode order
+            with ThreadPoolExecutor(max_workers=self.num_envs) as executor:
+                return list(executor.map(fetch_episode_info, self.episode_ids))
         except Exception as e:
             logger.error(f"Failed to get episode info: {e}")
             return [{'error': str(e)} for _ in range(self.num_envs)]
@@ -670,7 +685,8 @@ def create_student_gym_env_vectorized(
         step_size: int = 10,
         return_all_states: bool = True,
         episode_ids: Optional[List[str]] = None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        http2: bool = False
 ) -> StudentGymEnvVectorized:
     """
     Factory function to create a student gym vectorized environment.
@@ -690,6 +706,7 @@ def create_student_gym_env_vectorized(
         return_all_states: Return observations for all steps in step_size (default: True)
         episode_ids: Optional list of existing episode IDs to restore
         session_id: Optional existing session ID
+        http2: Use HTTP/2 (only for https:// server URLs, requires the h2 package)
 
     Returns:
         StudentGymEnvVectorized instance
@@ -782,7 +799,8 @@ def create_student_gym_env_vectorized(
         timeout=config_timeout,
         prod=prod,
         step_size=step_size,
-        return_all_states=return_all_states
+        return_all_states=return_all_states,
+        http2=http2
     )
 
     return StudentGymEnvVectorized(